@@ -6,5 +6,15 @@ MetaBall is a Python package for MetaBall, an soft end-of-robot module capable o
 It provides functionalities for camera calibration, image capturing, and running the MetaBall model.
 """
 
-from metaball.metaball import MetaBall
 from metaball.__version__ import __version__
+
+__all__ = ["MetaBall", "__version__"]
+
+
+def __getattr__(name):
+    # Import MetaBall lazily, so the camera and model stack is only loaded when used
+    if name == "MetaBall":
+        from metaball.metaball import MetaBall
+
+        return MetaBall
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,10 +1,8 @@
 """
 Enable `metaball.__version__` to be imported.
-"""
 
-from importlib.metadata import version, PackageNotFoundError
+This is the single source of the package version, which is read statically by
+setuptools at build time, so importing it does not query the package metadata.
+"""
 
-try:
-    __version__ = version("metaball")
-except PackageNotFoundError:
-    __version__ = "unknown"
+__version__ = "0.1.0"
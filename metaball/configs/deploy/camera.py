@@ -6,7 +6,7 @@ from dataclasses import dataclass
 from typing import Tuple
 
 
-@dataclass
+@dataclass(slots=True)
 class CameraConfig:
     host: str = "10.114.201.1"
     """Camera host address."""
@@ -45,6 +45,9 @@ class CameraConfig:
     marker_num: int = 1
     """Number of markers."""
 
+    draw_markers: bool = True
+    """Draw the detected markers and axes on the image."""
+
     transfer_tvec: Tuple[Tuple[Tuple[float, ...], ...], ...] = (
         (
             (0.0, 0.0, -25.0),
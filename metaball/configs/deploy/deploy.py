@@ -6,7 +6,7 @@ from dataclasses import dataclass, field
 from .camera import CameraConfig
 
 
-@dataclass
+@dataclass(slots=True)
 class DeployConfig:
     host: str = "127.0.0.1"
     """Host address for the publisher."""
@@ -16,5 +16,9 @@ class DeployConfig:
 
     onnx_path: str = "./models/BallNet.onnx"
     """Path to the ONNX model file."""
+
+    device: str = "auto"
+    """Device for ONNX model inference, one of "auto", "cpu", "cuda", "tensorrt", or "hailo".
+    "auto" uses TensorRT or CUDA if available, and the CPU otherwise."""
     
     camera: CameraConfig = field(default_factory=CameraConfig)
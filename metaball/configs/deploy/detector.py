@@ -5,7 +5,7 @@ Dataclass for detector configuration parameters.
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(slots=True)
 class DetectorConfig:
     adaptiveThreshConstant: int = 7
     "Constant for adaptive thresholding before finding contours"
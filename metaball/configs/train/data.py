@@ -6,7 +6,7 @@ from dataclasses import dataclass
 from typing import Tuple
 
 
-@dataclass
+@dataclass(slots=True)
 class DataConfig:
     dataset_path: str = "./data/metaball/sim"
     """Path to the dataset directory."""
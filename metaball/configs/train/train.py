@@ -7,7 +7,7 @@ from .data import DataConfig
 from .model import ModelConfig
 
 
-@dataclass
+@dataclass(slots=True)
 class TrainConfig:
     batch_size: int = 128
     """Batch size for training."""
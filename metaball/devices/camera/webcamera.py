@@ -4,12 +4,12 @@ import argparse
 import time
 import cv2
 import numpy as np
-import yaml
-from typing import Tuple
-from collections import deque
+from typing import Optional, Tuple
 from scipy.spatial.transform import Rotation as R
 from metaball.modules.zmq import CameraSubscriber
 from metaball.configs.deploy import CameraConfig, DetectorConfig
+from metaball.utils.camera_utils import create_aruco_detector
+from metaball.utils.config_utils import config_from_dict, load_config_file
 
 
 class WebCamera:
@@ -37,8 +37,8 @@ class WebCamera:
         # Set the camera parameters
         self.width = camera_cfg.width
         self.height = camera_cfg.height
-        self.mtx = np.array(camera_cfg.mtx)
-        self.dist_coeff = np.array(camera_cfg.dist_coeff)
+        self.mtx = np.ascontiguousarray(camera_cfg.mtx, dtype=np.float64)
+        self.dist_coeff = np.ascontiguousarray(camera_cfg.dist_coeff, dtype=np.float64)
         if camera_cfg.host is None:
             raise ValueError(
                 "Camera host is not set. Please check the configuration file."
@@ -46,32 +46,27 @@ class WebCamera:
         self.camera = CameraSubscriber(host=camera_cfg.host, port=camera_cfg.port)
         _, dist_coeff, mtx = self.camera.subscribeMessage()
         if len(dist_coeff) == self.dist_coeff.size:
-            self.dist_coeff = np.array(dist_coeff).reshape(self.dist_coeff.shape)
+            self.dist_coeff = np.array(dist_coeff, dtype=np.float64).reshape(self.dist_coeff.shape)
         if len(mtx) == self.mtx.size:
-            self.mtx = np.array(mtx).reshape(self.mtx.shape)
+            self.mtx = np.array(mtx, dtype=np.float64).reshape(self.mtx.shape)
         print(f"Resolution: {self.width}x{self.height}")
         print(f"Camera matrix:\n{self.mtx}")
         print(f"Camera distortion:\n{self.dist_coeff}")
 
-        # Set the detector parameters
-        aruco_dict = cv2.aruco.getPredefinedDictionary(cv2.aruco.DICT_4X4_100)
-        aruco_detector_params = cv2.aruco.DetectorParameters()
-        if detector_cfg is not None:
-            for v in vars(detector_cfg):
-                if hasattr(aruco_detector_params, v):
-                    setattr(aruco_detector_params, v, getattr(detector_cfg, v))
-        self.detector = cv2.aruco.ArucoDetector(aruco_dict, aruco_detector_params)
+        # Create the detector
+        self.detector = create_aruco_detector(detector_cfg)
         self.aruco_estimate_params = cv2.aruco.EstimateParameters()
         self.aruco_estimate_params.solvePnPMethod = cv2.SOLVEPNP_IPPE_SQUARE
         
         # Set the marker size
         self.marker_size = camera_cfg.marker_size
         self.marker_num = camera_cfg.marker_num
+        self.draw_markers = camera_cfg.draw_markers
         print(f"Marker size: {self.marker_size}")
         
         # Set the translation and rotation from marker frame to global frame
-        self.transfer_tvec = np.array(camera_cfg.transfer_tvec)
-        self.transfer_rmat = np.array(camera_cfg.transfer_rmat)
+        self.transfer_tvec = np.ascontiguousarray(camera_cfg.transfer_tvec, dtype=np.float64)
+        self.transfer_rmat = np.ascontiguousarray(camera_cfg.transfer_rmat, dtype=np.float64)
         print(f"Transfer tvec:\n{self.transfer_tvec}")
         print(f"Transfer rmat:\n{self.transfer_rmat}")
         
@@ -89,8 +84,12 @@ class WebCamera:
         print(f"Pose Filter: {self.filter_on}")
         if self.filter_on:
             print(f"Filter frame: {self.filter_frame}")
+        self.pose_history = np.zeros([self.filter_frame, self.marker_num, 6])
+        self.pose_history_head = 0
+        self.pose_history_count = 0
         self.last_pose = np.zeros([self.marker_num, 6])
-        self.img = np.zeros((self.height, self.width, 3))
+        self.img = np.zeros((self.height, self.width, 3), dtype=np.uint8)
+        self.img_jpeg = b""
         self.first_frame = True
 
         # Check if the camera is connected
@@ -105,7 +104,11 @@ class WebCamera:
         self.init_pose = self._calculateInitPose()
         self.init_tvec = self.init_pose[:, :3]
         self.init_rvec = self.init_pose[:, 3:]
-        self.init_rmat = [R.from_rotvec(rvec).as_matrix() for rvec in self.init_rvec]
+        self.init_rmat = R.from_rotvec(self.init_rvec).as_matrix()
+        # The inverse of a rotation matrix is its transpose
+        self.init_rmat_inv = np.ascontiguousarray(self.init_rmat.transpose(0, 2, 1))
+        # Combine the reference and axis transfer rotations
+        self.ref_to_global_rmat = self.transfer_rmat @ self.init_rmat_inv
         print(f"Initial pose: {self.init_pose}")
 
     def _calculateInitPose(self) -> np.ndarray:
@@ -118,21 +121,21 @@ class WebCamera:
             pose (numpy.ndarray([n, 6])): The pose vector.
         """
 
-        # Create lists to store the tvec and rvec
-        tvec_list = []
-        rvec_list = []
+        # Preallocate the buffer to store the poses
+        pose_list = np.empty([60, self.marker_num, 6])
+        count = 0
 
-        # Get the pose for 60 frames
+        # Get the pose for 60 frames, skipping frames with a different number of markers
         for i in range(60):
             pose, _ = self.readImageAndPose()
-            tvec_list.append(pose[:, :3])
-            rvec_list.append(pose[:, 3:])
+            if pose.shape == pose_list.shape[1:]:
+                pose_list[count] = pose
+                count += 1
 
         # Calculate the mean of n poses
-        tvec_list = np.array(tvec_list).reshape(-1, 3)
-        tvec = np.mean(tvec_list, axis=0)
-        rvec_list = np.array(rvec_list).reshape(-1, 3)
-        rvec = R.from_rotvec(rvec_list).mean().as_rotvec()
+        pose_list = pose_list[:count].reshape(-1, 6)
+        tvec = np.mean(pose_list[:, :3], axis=0)
+        rvec = R.from_rotvec(pose_list[:, 3:]).mean().as_rotvec()
         pose = np.hstack((tvec, rvec)).reshape(-1, 6)
 
         return pose
@@ -141,9 +144,11 @@ class WebCamera:
         """
         Filter the pose.
 
-        The function is to filter the pose by the mean of the pose list.
-        If the pose list is less than the frame, the pose will be appended to the pose list directly.
-        Otherwise, the first pose will be popped and the pose will be appended to the pose list.
+        The function is to filter the pose by the mean of the pose history.
+        The pose history is a preallocated ring buffer of the last `filter_frame` poses.
+        The pose overwrites the oldest pose in the history, and the filtered pose
+        replaces it after filtering. If the number of markers does not match,
+        the pose is returned without filtering.
 
         Args:
             pose (numpy.ndarray([n, 6])): The pose vector.
@@ -152,29 +157,31 @@ class WebCamera:
             filtered_pose (numpy.ndarray([n, 6])): The filtered pose vector.
         """
 
-        # Initialize the pose deque if not already initialized
-        if not hasattr(self, "pose_history"):
-            self.pose_history = deque(maxlen=self.filter_frame)
+        # Check if the pose matches the pose history
+        if pose.shape != self.pose_history.shape[1:]:
+            return pose
+
+        # Write the pose to the pose history
+        head = self.pose_history_head
+        self.pose_history[head] = pose
+        self.pose_history_head = (head + 1) % self.filter_frame
+        self.pose_history_count = min(self.pose_history_count + 1, self.filter_frame)
+        pose_history = self.pose_history[: self.pose_history_count]
+
+        # Calculate the mean of the tvec
+        tvec = pose_history[:, :, :3].mean(axis=0)
+
+        # Calculate the mean of the rvec by averaging the quaternions of all markers at once,
+        # flipping each quaternion to the hemisphere of the newest one
+        quat = R.from_rotvec(pose_history[:, :, 3:].reshape(-1, 3)).as_quat().reshape(-1, len(pose), 4)
+        sign = np.sign(np.einsum("fmk,mk->fm", quat, quat[head]))
+        sign[sign == 0] = 1.0
+        quat_mean = np.einsum("fm,fmk->mk", sign, quat)
+        rvec = R.from_quat(quat_mean).as_rotvec()
+        filtered_pose = np.hstack((tvec, rvec))
 
-        # Append the pose to the pose history
-        self.pose_history.append(pose)
-
-        filtered_pose = []
-        for i in range(len(pose)):
-            # Calculate the mean of the pose list
-            pose_list = np.array([pose[i] for pose in self.pose_history])
-            # Calculate the mean of the tvec and rvec
-            tvec_list = pose_list[:, :3]
-            tvec = np.mean(tvec_list, axis=0)
-            rvec_list = pose_list[:, 3:]
-            rvec = R.from_rotvec(rvec_list).mean().as_rotvec()
-
-            # Append the filtered pose to the filtered pose list
-            filtered_pose.append(np.hstack((tvec, rvec)))
-
-        filtered_pose = np.array(filtered_pose).reshape(-1, 6)
         # Copy the filtered pose to the last pose
-        self.pose_history[-1] = filtered_pose
+        self.pose_history[head] = filtered_pose
 
         # Return the filtered pose
         return filtered_pose
@@ -223,6 +230,10 @@ class WebCamera:
         if self.filter_on:
             pose = self._poseFilter(pose)
 
+        # Skip drawing if not needed
+        if not self.draw_markers:
+            return pose, img
+
         # Draw the markers
         color_image_result = cv2.aruco.drawDetectedMarkers(img, corners, ids)
         color_image_result = cv2.drawFrameAxes(
@@ -266,6 +277,8 @@ class WebCamera:
 
         Using the OpenCV, the function will read the image from the camera.
         If the image is not read, the function will raise an error.
+        If the markers are not drawn, the JPEG bytes received from the camera are kept
+        in img_jpeg, so that they can be forwarded without encoding the image again.
 
         Args:
             None
@@ -279,8 +292,11 @@ class WebCamera:
 
         # Read the image from the camera
         try:
-            img, _, _ = self.camera.subscribeMessage()
-            img = cv2.imdecode(img, cv2.IMREAD_COLOR)
+            img_jpeg, _, _ = self.camera.subscribeMessage()
+            if not self.draw_markers:
+                # Take the bytes the array views, copying only if it does not view bytes
+                self.img_jpeg = img_jpeg.base if isinstance(img_jpeg.base, bytes) else img_jpeg.tobytes()
+            img = cv2.imdecode(img_jpeg, cv2.IMREAD_COLOR)
         except Exception:
             raise ValueError(
                 f"Error reading image from camera. Please check the camera connection."
@@ -346,26 +362,49 @@ class WebCamera:
         """
 
         pose = pose.reshape(-1, 6)
-        ref_pose = []
-        for i in range(len(pose)):
-            # Convert rvec to rotation matrix
-            rvec = pose[i, 3:]  # rx, ry, rz
-            rmat = R.from_rotvec(rvec).as_matrix()  # Current rotation matrix
+        n = len(pose)
+        init_rmat_inv = self.init_rmat_inv[:n]
 
-            # Calculate the relative rotation (initial_rmat is the initial rotation matrix)
-            rmat = np.linalg.inv(self.init_rmat[i]) @ rmat
-            rvec = R.from_matrix(rmat).as_rotvec()  # Convert back to rotation vector
+        # Calculate the relative rotations in one batched matmul
+        rmat = init_rmat_inv @ R.from_rotvec(pose[:, 3:]).as_matrix()
+        rvec = R.from_matrix(rmat).as_rotvec()
 
-            # Convert tvec (translation) to the reference frame
-            tvec = np.linalg.inv(self.init_rmat[i]) @ (
-                pose[i, :3] - self.init_tvec[i]
-            )  # Compute the relative translation
-
-            # Combine tvec and rvec into the reference pose
-            ref_pose.append(np.hstack((tvec, rvec)))
+        # Convert the tvecs to the reference frame
+        tvec = np.einsum("nij,nj->ni", init_rmat_inv, pose[:, :3] - self.init_tvec[:n])
 
         # Return the reference pose
-        return np.array(ref_pose).reshape(-1, 6)
+        return np.hstack((tvec, rvec))
+
+    def poseToGlobalEuler(self, pose: np.ndarray) -> np.ndarray:
+        """
+        Convert the pose to the euler pose in the global frame.
+
+        The function is equivalent to poseToReferece, poseAxisTransfer and poseVectorToEuler in series.
+        With the precomputed rotation from the reference frame to the global frame, the rotation is
+        converted by one matrix product per marker and the tvec by one matrix-vector product per marker.
+        The unit of the euler angles is radian.
+
+        Args:
+            pose (numpy.ndarray([n, 6])): The pose vector.
+
+        Returns:
+            pose_euler (numpy.ndarray([n, 6])): The pose with euler angles in the global frame.
+        """
+
+        pose = pose.reshape(-1, 6)
+        n = len(pose)
+        ref_to_global_rmat = self.ref_to_global_rmat[:n]
+        transfer_rmat = self.transfer_rmat[:n]
+
+        # Convert the rotation to the global frame and then to the euler angles
+        rmat = ref_to_global_rmat @ R.from_rotvec(pose[:, 3:]).as_matrix() @ transfer_rmat.transpose(0, 2, 1)
+        rpy = R.from_matrix(rmat).as_euler("xyz", degrees=False)
+
+        # Convert the tvec to the global frame
+        tvec = np.einsum("nij,nj->ni", ref_to_global_rmat, pose[:, :3] - self.init_tvec[:n])
+
+        # Return the euler pose
+        return np.hstack((tvec, rpy))
 
     def poseVectorToEuler(self, pose: np.ndarray) -> np.ndarray:
         """
@@ -382,17 +421,12 @@ class WebCamera:
         """
 
         pose = pose.reshape(-1, 6)
-        pose_euler = []
-        for i in range(len(pose)):
-            # Convert rvec to rotation matrix
-            rvec = pose[i, 3:]
-            rr = R.from_rotvec(rvec)
-            rpy = rr.as_euler("xyz", degrees=False)
-            # Create the euler pose
-            pose_euler.append(np.hstack((pose[i, :3], rpy)))
+
+        # Convert the rvecs of all markers at once
+        rpy = R.from_rotvec(pose[:, 3:]).as_euler("xyz", degrees=False)
 
         # Return the euler pose
-        return np.array(pose_euler).reshape(-1, 6)
+        return np.hstack((pose[:, :3], rpy))
 
     def poseVectorToQuaternion(self, pose: np.ndarray) -> np.ndarray:
         """
@@ -409,19 +443,14 @@ class WebCamera:
         """
 
         pose = pose.reshape(-1, 6)
-        pose_quat = []
-        for i in range(len(pose)):
-            # Convert rvec to rotation matrix
-            rvec = pose[i, 3:]
-            rr = R.from_rotvec(rvec)
-            quat = rr.as_quat()
-            # Create the quaternion pose
-            pose_quat.append(np.hstack((pose[i, :3], quat)))
+
+        # Convert the rvecs of all markers at once
+        quat = R.from_rotvec(pose[:, 3:]).as_quat()
 
         # Return the quaternion pose
-        return np.array(pose_quat).reshape(-1, 7)
+        return np.hstack((pose[:, :3], quat))
 
-    def poseVectorToMatrix(self, pose: np.ndarray) -> np.ndarray:
+    def poseVectorToMatrix(self, pose: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
         """
         Convert the pose to the matrix.
 
@@ -434,26 +463,34 @@ class WebCamera:
 
         Args:
             pose (numpy.ndarray([n, 6])): The pose vector.
+            out (numpy.ndarray([n, 4, 4]), optional): A buffer to write the matrix into,
+                so that callers at frame rate can reuse it. Defaults to None.
 
         Returns:
             pose_matrix (numpy.ndarray([n, 4, 4])): The pose matrix.
+
+        Raises:
+            ValueError: If the shape of the buffer does not match the pose.
         """
 
         pose = pose.reshape(-1, 6)
-        pose_matrix = []
-        for i in range(len(pose)):
-            # Convert rvec to rotation matrix
-            rvec = pose[i, 3:]
-            rr = R.from_rotvec(rvec)
 
-            # Create the matrix pose
-            pose_matrix.append(np.eye(4))
-            pose_matrix[i][:3, :3] = rr.as_matrix()
-            pose_matrix[i][:3, 3] = pose[i][:3]
-            pose_matrix[i][3, 3] = 1.0
+        # Allocate the matrix pose for all markers at once, or write it into the buffer
+        if out is None:
+            pose_matrix = np.empty((len(pose), 4, 4))
+        elif out.shape != (len(pose), 4, 4):
+            raise ValueError(f"The buffer shape {out.shape} does not match ({len(pose)}, 4, 4).")
+        else:
+            pose_matrix = out
+
+        # Fill the rotation, translation and homogeneous row
+        pose_matrix[:, :3, :3] = R.from_rotvec(pose[:, 3:]).as_matrix()
+        pose_matrix[:, :3, 3] = pose[:, :3]
+        pose_matrix[:, 3, :3] = 0.0
+        pose_matrix[:, 3, 3] = 1.0
 
         # Return the matrix pose
-        return np.array(pose_matrix).reshape(-1, 4, 4)
+        return pose_matrix
 
     def poseAxisTransfer(self, pose: np.ndarray) -> np.ndarray:
         """
@@ -468,22 +505,19 @@ class WebCamera:
 
         # Reshape the pose to [n, 6]
         pose_ori = pose.reshape(-1, 6)
-        pose_transfer = []
-        for i in range(len(pose_ori)):
-            # Convert rvec to rotation matrix
-            rotation_matrix = R.from_rotvec(pose_ori[i, 3:]).as_matrix()
-            rvec = R.from_matrix(
-                self.transfer_rmat[i] @ rotation_matrix @ self.transfer_rmat[i].T
-            ).as_rotvec()
+        transfer_rmat = self.transfer_rmat[: len(pose_ori)]
 
-            # Convert tvec to the global frame
-            tvec = self.transfer_rmat[i] @ pose_ori[i, :3]
+        # Convert the rvecs to the global frame in one batched matmul
+        rotation_matrix = R.from_rotvec(pose_ori[:, 3:]).as_matrix()
+        rvec = R.from_matrix(
+            transfer_rmat @ rotation_matrix @ transfer_rmat.transpose(0, 2, 1)
+        ).as_rotvec()
 
-            # Combine tvec and rvec into the global pose
-            pose_transfer.append(np.hstack((tvec, rvec)))
+        # Convert the tvecs to the global frame
+        tvec = np.einsum("nij,nj->ni", transfer_rmat, pose_ori[:, :3])
 
         # Return the global pose
-        return np.array(pose_transfer).reshape(-1, 6)
+        return np.hstack((tvec, rvec))
 
 
 if __name__ == "__main__":
@@ -506,9 +540,8 @@ if __name__ == "__main__":
     if args.params_path is None:
         camera_cfg = CameraConfig()
     else:
-        with open(args.params_path, "r") as f:
-            camera_params = yaml.load(f.read(), Loader=yaml.Loader)
-        camera_cfg = CameraConfig(**camera_params)
+        camera_params = load_config_file(args.params_path)
+        camera_cfg = config_from_dict(CameraConfig, camera_params)
 
     try:
         
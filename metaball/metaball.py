@@ -2,12 +2,14 @@
 MetaBall Class.
 """
 
+import queue
+import threading
 import time
-import cv2
 from metaball.devices.camera import WebCamera
 from metaball.modules.zmq import MetaBallPublisher
 from metaball.models.onnx.ballnet import BallNet
 from metaball.configs.deploy import DeployConfig
+from metaball.utils.camera_utils import img_encode
 
 
 class MetaBall:
@@ -36,7 +38,7 @@ class MetaBall:
         self.camera = WebCamera(cfg.camera)
 
         # Create a BallNet model
-        self.ballnet = BallNet(cfg.onnx_path)
+        self.ballnet = BallNet(cfg.onnx_path, device=cfg.device)
 
         # Create a metaball publisher
         self.metaball_publisher = MetaBallPublisher(host=cfg.host, port=cfg.port)
@@ -52,13 +54,94 @@ class MetaBall:
         # Close the metaball publisher
         self.metaball_publisher.close()
 
+    @staticmethod
+    def _putLatest(q: queue.Queue, item: tuple) -> None:
+        """
+        Put an item into a single-slot queue, replacing the stale item if any.
+
+        Args:
+            q (queue.Queue): The single-slot queue.
+            item (tuple): The item to put.
+        """
+
+        try:
+            q.get_nowait()
+        except queue.Empty:
+            pass
+        q.put_nowait(item)
+
+    def _captureLoop(self, stop_event: threading.Event, capture_queue: queue.Queue, errors: list) -> None:
+        """
+        Capture the images and poses from the camera until stopped.
+
+        If the markers are not drawn, the image is unchanged from the camera,
+        so the JPEG bytes received from the camera are passed on instead of the image.
+
+        Args:
+            stop_event (threading.Event): The event to stop the loop.
+            capture_queue (queue.Queue): The queue to put the latest pose and image.
+            errors (list): The list to collect the raised exception.
+        """
+
+        try:
+            while not stop_event.is_set():
+                # Get the image and pose
+                pose, img = self.camera.readImageAndPose()
+                if not self.camera.draw_markers:
+                    img = self.camera.img_jpeg
+                self._putLatest(capture_queue, (pose.copy(), img))
+        except Exception as e:
+            errors.append(e)
+            stop_event.set()
+
+    def _publishLoop(self, stop_event: threading.Event, publish_queue: queue.Queue, errors: list) -> None:
+        """
+        Encode the images and publish the messages until stopped.
+
+        Args:
+            stop_event (threading.Event): The event to stop the loop.
+            publish_queue (queue.Queue): The queue to get the latest results.
+            errors (list): The list to collect the raised exception.
+        """
+
+        try:
+            while not stop_event.is_set():
+                try:
+                    img, pose_euler, force, node = publish_queue.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+
+                # Publish the message, encoding the image unless it is already JPEG bytes
+                self.metaball_publisher.publishMessage(
+                    img if isinstance(img, bytes) else img_encode(img),
+                    pose_euler.ravel(),
+                    force.ravel(),
+                    node.ravel(),
+                )
+        except Exception as e:
+            errors.append(e)
+            stop_event.set()
+
     def run(self) -> None:
         """
         Run the metaball.
+
+        Capturing, inference, and publishing run as a three-stage pipeline.
+        The camera is read in a capture thread, the pose is converted and the
+        force and node are inferred in the calling thread, and the image is
+        encoded and published in a publish thread. The stages are connected by
+        single-slot queues that always hold the latest item.
         """
 
-        # Set the jpeg parameters
-        jpeg_params = [cv2.IMWRITE_JPEG_QUALITY, 50]
+        # Create the pipeline
+        stop_event = threading.Event()
+        capture_queue = queue.Queue(maxsize=1)
+        publish_queue = queue.Queue(maxsize=1)
+        errors = []
+        threads = [
+            threading.Thread(target=self._captureLoop, args=(stop_event, capture_queue, errors), daemon=True),
+            threading.Thread(target=self._publishLoop, args=(stop_event, publish_queue, errors), daemon=True),
+        ]
 
         # Initialize the variables
         start_time = time.time()
@@ -66,26 +149,24 @@ class MetaBall:
 
         # Start publishing
         try:
-            while True:
-                # Get the image and pose
-                pose, img = self.camera.readImageAndPose()
-                # Convert the pose to the reference pose
-                pose_ref = self.camera.poseToReferece(pose)
-                # Convert the pose from the marker frame to the camera frame
-                pose_global = self.camera.poseAxisTransfer(pose_ref)
-                # Convert the pose to the euler angles
-                pose_euler = self.camera.poseVectorToEuler(pose_global)
+            for thread in threads:
+                thread.start()
+
+            while not stop_event.is_set():
+                # Get the latest image and pose
+                try:
+                    pose, img = capture_queue.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+
+                # Convert the pose to the euler pose in the global frame
+                pose_euler = self.camera.poseToGlobalEuler(pose)
 
                 # Predict the force and node
                 force, node = self.ballnet.infer(pose_euler)
 
-                # Publish the message
-                self.metaball_publisher.publishMessage(
-                    cv2.imencode(".jpg", img, jpeg_params)[1].tobytes(),
-                    pose_euler.flatten().tolist(),
-                    force.flatten().tolist(),
-                    node.flatten().tolist(),
-                )
+                # Hand over the results to the publish thread
+                self._putLatest(publish_queue, (img, pose_euler, force, node))
 
                 frame_count += 1
 
@@ -94,8 +175,18 @@ class MetaBall:
                     print(f"FPS: %.2f" % (frame_count / (time.time() - start_time)))
                     start_time = time.time()
                     frame_count = 0
+
+            # Raise the exception from the pipeline threads
+            if errors:
+                raise errors[0]
         except KeyboardInterrupt:
             print("Stopping the camera...")
         finally:
+            # Stop the pipeline
+            stop_event.set()
+            for thread in threads:
+                if thread.is_alive():
+                    thread.join()
+
             # Release the metaball
             self.release()
@@ -1,3 +1,18 @@
-from .onnx import BallNet as BallNetRuntime
-from .torch import BallNet as BallNet
-from .torch import MetaBallDataModule
\ No newline at end of file
+__all__ = ["BallNetRuntime", "BallNet", "MetaBallDataModule"]
+
+
+def __getattr__(name):
+    # Import the backends lazily, so deploying with ONNX Runtime does not load PyTorch
+    if name == "BallNetRuntime":
+        from .onnx import BallNet as BallNetRuntime
+
+        return BallNetRuntime
+    if name == "BallNet":
+        from .torch import BallNet
+
+        return BallNet
+    if name == "MetaBallDataModule":
+        from .torch import MetaBallDataModule
+
+        return MetaBallDataModule
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
@@ -16,6 +16,8 @@ For more information, please refer to https://github.com/han-xudong/metaball
 """
 
 import argparse
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Tuple
 import numpy as np
 from metaball.utils.nn_utils import init_model
@@ -29,22 +31,25 @@ class BallNet:
     The model is loaded using ONNX Runtime.
     """
 
-    def __init__(self, onnx_path: str) -> None:
+    def __init__(self, onnx_path: str, device: str = "auto", num_threads: int = 1) -> None:
         """
         BallNet initialization.
 
         Args:
             onnx_path (str): The path to the ONNX model file.
+            device (str, optional): The device to be used for inference. Default is "auto".
+            num_threads (int, optional): The number of intra-op threads. Default is 1.
         """
 
         # Create a ONNX runtime model
         try:
-            self.model = init_model(onnx_path)
+            self.model = init_model(onnx_path, device=device, num_threads=num_threads)
         except Exception as e:
             raise ValueError(f"Failed to load the model: {e}")
 
         # Print the initialization message
         print("Model Path:", onnx_path)
+        print("Providers:", self.model.get_providers())
         print(
             "Input:",
             [f"{input.name} ({input.shape[0]}, {input.shape[1]})" for input in self.model.get_inputs()],
@@ -54,6 +59,25 @@ class BallNet:
             [f"{output.name} ({output.shape[0]}, {output.shape[1]})" for output in self.model.get_outputs()],
         )
 
+        # Create the executor for asynchronous inference, sized so that the runs do not oversubscribe the CPU
+        self.executor = ThreadPoolExecutor(max_workers=max(1, (os.cpu_count() or 1) // num_threads))
+
+        # Allocate the input and output buffers once
+        model_input = self.model.get_inputs()[0]
+        self.input_name = model_input.name
+        self.motion = np.empty((1, model_input.shape[1]), dtype=np.float32)
+        self.outputs = [
+            np.empty((1, output.shape[1]), dtype=np.float32) for output in self.model.get_outputs()
+        ]
+
+        # Bind the buffers to the model, so that inference neither allocates nor copies them
+        self.io_binding = self.model.io_binding()
+        self.io_binding.bind_input(
+            self.input_name, "cpu", 0, np.float32, self.motion.shape, self.motion.ctypes.data
+        )
+        for output, buffer in zip(self.model.get_outputs(), self.outputs):
+            self.io_binding.bind_output(output.name, "cpu", 0, np.float32, buffer.shape, buffer.ctypes.data)
+
     def infer(self, motion: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
         """
         Inference.
@@ -67,7 +91,74 @@ class BallNet:
                 - node (numpy.ndarray): The node displacement of the MetaBall.
         """
 
-        return self.model.run(None, {"motion": motion.astype(np.float32).reshape(1, -1)})
+        force, node = self.infer_inplace(motion)
+
+        return force.copy(), node.copy()
+
+    def infer_inplace(self, motion: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Inference into the preallocated output buffers.
+
+        Unlike infer, the returned arrays are the buffers bound to the model,
+        which are overwritten by the next call. They should be copied if they are kept.
+
+        Args:
+            motion (numpy.ndarray): The motion of the MetaBall.
+
+        Returns:
+            inference (tuple): Inference results.
+                - force (numpy.ndarray): The force on the bottom surface of the MetaBall.
+                - node (numpy.ndarray): The node displacement of the MetaBall.
+        """
+
+        # Copy the motion into the bound input buffer
+        np.copyto(self.motion, motion.reshape(1, -1), casting="same_kind")
+
+        # Run the model into the bound output buffers
+        self.model.run_with_iobinding(self.io_binding)
+
+        return self.outputs[0], self.outputs[1]
+
+    def infer_batch(self, motions: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Batch inference.
+
+        The motions are forwarded to the model in a single run along the batch axis,
+        instead of calling infer once per motion.
+
+        Args:
+            motions (numpy.ndarray([n, d])): The motions of the MetaBall.
+
+        Returns:
+            inference (tuple): Inference results.
+                - force (numpy.ndarray([n, ...])): The forces on the bottom surface of the MetaBall.
+                - node (numpy.ndarray([n, ...])): The node displacements of the MetaBall.
+        """
+
+        # Stack the motions into a contiguous batch
+        motions = np.ascontiguousarray(motions, dtype=np.float32).reshape(-1, self.motion.shape[1])
+
+        force, node = self.model.run(None, {self.input_name: motions})
+
+        return force, node
+
+    def infer_async(self, motion: np.ndarray) -> Future:
+        """
+        Asynchronous inference.
+
+        The inference is submitted to a thread pool, so that runs for several motion
+        streams overlap.
+
+        Args:
+            motion (numpy.ndarray): The motion of the MetaBall.
+
+        Returns:
+            future (concurrent.futures.Future): The future of the inference results.
+                - force (numpy.ndarray): The force on the bottom surface of the MetaBall.
+                - node (numpy.ndarray): The node displacement of the MetaBall.
+        """
+
+        return self.executor.submit(self.infer_batch, motion)
 
 
 if __name__ == "__main__":
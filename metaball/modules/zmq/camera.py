@@ -19,6 +19,7 @@ class CameraSubscriber:
         subscriber (zmq.Socket): The ZMQ subscriber socket.
         poller (zmq.Poller): The ZMQ poller for handling timeouts.
         timeout (int): Maximum time to wait for a message in milliseconds.
+        message (Camera): The reused protobuf message.
     """
 
     def __init__(
@@ -57,6 +58,8 @@ class CameraSubscriber:
         self.poller = zmq.Poller()
         self.poller.register(self.subscriber, zmq.POLLIN)
         self.timeout = timeout
+        # Create the message once, and reuse it for every subscribe
+        self.message = cam_msg_pb2.Camera()
 
     def subscribeMessage(self) -> Tuple[np.ndarray, list, list]:
         """
@@ -69,20 +72,22 @@ class CameraSubscriber:
                 - mtx (list): The camera matrix.
 
         Raises:
-            zmq.ZMQError: If no message is received within the timeout period.
+            RuntimeError: If no message is received within the timeout period.
         """
-        # Wait for message with timeout
-        if self.poller.poll(self.timeout):
-            # Receive the message
-            msg = self.subscriber.recv()
-
-            # Parse the message
-            cam = cam_msg_pb2.Camera()
-            cam.ParseFromString(msg)
-
-            return np.frombuffer(cam.img, dtype=np.uint8), cam.dist_coeff, cam.mtx
-        else:
-            raise RuntimeError("No message received within the timeout period.")
+        # Receive the message without copying it out of the ZMQ frame,
+        # waiting with timeout only if no message is queued yet
+        try:
+            frame = self.subscriber.recv(flags=zmq.NOBLOCK, copy=False)
+        except zmq.Again:
+            if not self.poller.poll(self.timeout):
+                raise RuntimeError("No message received within the timeout period.")
+            frame = self.subscriber.recv(copy=False)
+
+        # Parse the message directly from the frame buffer, which clears the previous one
+        cam = self.message
+        cam.ParseFromString(frame.buffer)
+
+        return np.frombuffer(cam.img, dtype=np.uint8), cam.dist_coeff, cam.mtx
 
     def close(self):
         """
@@ -4,10 +4,13 @@ MetaBall Publisher and Subscriber using ZeroMQ and Protobuf.
 
 import zmq
 import numpy as np
-from typing import Tuple
+from typing import Optional, Tuple, Union
 from datetime import datetime
 from metaball.modules.protobuf import metaball_msg_pb2
 
+# Immutable default for the pose, force, and node
+_ZERO6 = (0.0,) * 6
+
 
 class MetaBallPublisher:
     """
@@ -18,6 +21,7 @@ class MetaBallPublisher:
     Attributes:
         context (zmq.Context): The ZMQ context for the publisher.
         publisher (zmq.Socket): The ZMQ publisher socket.
+        message (MetaBall): The reused protobuf message.
     """
 
     def __init__(
@@ -49,33 +53,48 @@ class MetaBallPublisher:
         self.publisher.setsockopt(zmq.CONFLATE, conflate)
         # Bind the address
         self.publisher.bind(f"tcp://{host}:{port}")
+        # Create the message once, and reuse it for every publish
+        self.message = metaball_msg_pb2.MetaBall()
 
     def publishMessage(
         self,
         img: bytes = b"",
-        pose: list = np.zeros(6, dtype=np.float32).tolist(),
-        force: list = np.zeros(6, dtype=np.float32).tolist(),
-        node: list = np.zeros(6, dtype=np.float32).tolist(),
+        pose: Optional[Union[list, np.ndarray]] = None,
+        force: Optional[Union[list, np.ndarray]] = None,
+        node: Optional[Union[list, np.ndarray]] = None,
     ) -> None:
         """Publish the message.
 
+        The pose, force, and node can be passed as flat NumPy arrays,
+        which are assigned to the message without converting them to lists first.
+
         Args:
             img (bytes): The image captured by the camera.
-            pose (list): The pose of the marker.
-            force (list): The force on the bottom surface of the metaball.
-            node (list): The node displacement of the metaball.
+            pose (list | numpy.ndarray, optional): The pose of the marker. Defaults to zeros.
+            force (list | numpy.ndarray, optional): The force on the bottom surface of the metaball. Defaults to zeros.
+            node (list | numpy.ndarray, optional): The node displacement of the metaball. Defaults to zeros.
         """
 
+        # Use zeros for the missing data
+        if pose is None:
+            pose = _ZERO6
+        if force is None:
+            force = _ZERO6
+        if node is None:
+            node = _ZERO6
+
         # Set the message
-        metaball = metaball_msg_pb2.MetaBall()
+        metaball = self.message
+        metaball.Clear()
         metaball.timestamp = datetime.now().timestamp()
         metaball.img = img
         metaball.pose[:] = pose
         metaball.force[:] = force
         metaball.node[:] = node
 
-        # Publish the message
-        self.publisher.send(metaball.SerializeToString())
+        # Publish the message without the required-field check, which proto3 messages do not need,
+        # and without copying the serialized buffer into ZMQ
+        self.publisher.send(metaball.SerializePartialToString(), copy=False)
 
     def close(self):
         """Close ZMQ socket and context to prevent memory leaks."""
@@ -94,6 +113,7 @@ class MetaBallSubscriber:
     Attributes:
         context (zmq.Context): The ZMQ context for the subscriber.
         subscriber (zmq.Socket): The ZMQ subscriber socket.
+        message (MetaBall): The reused protobuf message.
     """
 
     def __init__(
@@ -127,28 +147,34 @@ class MetaBallSubscriber:
         self.subscriber.connect(f"tcp://{host}:{port}")
         # Subscribe the topic
         self.subscriber.setsockopt_string(zmq.SUBSCRIBE, "")
+        # Create the message once, and reuse it for every subscribe
+        self.message = metaball_msg_pb2.MetaBall()
 
-    def subscribeMessage(self) -> Tuple[bytes, list, list, list]:
+    def subscribeMessage(self) -> Tuple[bytes, np.ndarray, np.ndarray, np.ndarray]:
         """
         Subscribe the message.
 
         Returns:
             data (tuple): metaball data.
                 - img (bytes): The image captured by the camera.
-                - pose (list): The pose of the marker.
-                - force (list): The force on the bottom surface of the metaball.
-                - node (list): The node displacement of the metaball.
+                - pose (numpy.ndarray): The pose of the marker.
+                - force (numpy.ndarray): The force on the bottom surface of the metaball.
+                - node (numpy.ndarray): The node displacement of the metaball.
         """
 
-        # Receive the message
-        metaball = metaball_msg_pb2.MetaBall()
-        metaball.ParseFromString(self.subscriber.recv())
+        # Receive the message without copying it out of the ZMQ frame
+        frame = self.subscriber.recv(copy=False)
+
+        # Parse the message directly from the frame buffer, which clears the previous one
+        metaball = self.message
+        metaball.ParseFromString(frame.buffer)
 
+        # Convert the repeated fields to arrays, matching their double precision
         return (
             metaball.img,
-            metaball.pose,
-            metaball.force,
-            metaball.node,
+            np.asarray(metaball.pose, dtype=np.float64),
+            np.asarray(metaball.force, dtype=np.float64),
+            np.asarray(metaball.node, dtype=np.float64),
         )
 
     def close(self):
@@ -2,9 +2,13 @@
 Utility functions for camera operations.
 """
 
+import os
 import cv2
 import numpy as np
-from typing import Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
+from metaball.configs.deploy import DetectorConfig
+from metaball.utils.config_utils import config_fields
 
 # Set the jpeg parameters
 JPEG_PARAMS = [cv2.IMWRITE_JPEG_QUALITY, 50]
@@ -27,6 +31,34 @@ def img_encode(img: np.ndarray) -> bytes:
     return img_encoded.tobytes()
 
 
+def create_aruco_detector(
+    detector_cfg: Optional[DetectorConfig] = None,
+    dictionary: int = cv2.aruco.DICT_4X4_100,
+) -> cv2.aruco.ArucoDetector:
+    """
+    Create an ArUco detector from the detector configuration.
+
+    The detector parameters are assembled once here, and the returned detector
+    is reused for every frame.
+
+    Args:
+        detector_cfg (DetectorConfig, optional): The detector configuration. OpenCV defaults are used if None.
+        dictionary (int, optional): The predefined ArUco dictionary. Default is DICT_4X4_100.
+
+    Returns:
+        detector (cv2.aruco.ArucoDetector): The ArUco detector.
+    """
+
+    # Set the detector parameters
+    aruco_dict = cv2.aruco.getPredefinedDictionary(dictionary)
+    aruco_detector_params = cv2.aruco.DetectorParameters()
+    if detector_cfg is not None:
+        for name in config_fields(DetectorConfig):
+            setattr(aruco_detector_params, name, getattr(detector_cfg, name))
+
+    return cv2.aruco.ArucoDetector(aruco_dict, aruco_detector_params)
+
+
 def calibrate_chessboard(
     images: list, chess_size: Tuple[int, int], square_size: float
 ) -> Tuple[np.ndarray, np.ndarray, list, list]:
@@ -44,20 +76,34 @@ def calibrate_chessboard(
             - dist_coeff (numpy.ndarray): Distortion coefficients.
             - rvecs (list): Rotation vectors.
             - tvecs (list): Translation vectors.
+
+    Raises:
+        ValueError: If no images are given.
     """
 
+    if len(images) == 0:
+        raise ValueError("No images are given for calibration.")
+
     # Prepare object points and image points for calibration
     pattern_points = np.zeros((chess_size[0] * chess_size[1], 3), np.float32)
     pattern_points[:, :2] = np.mgrid[0 : chess_size[0], 0 : chess_size[1]].T.reshape(-1, 2)
     pattern_points *= square_size
 
-    # Load the images for calibration
+    # Find the corners in all images in parallel with the sector-based detector,
+    # which refines the corners to sub-pixel accuracy itself
+    flags = cv2.CALIB_CB_NORMALIZE_IMAGE | cv2.CALIB_CB_EXHAUSTIVE | cv2.CALIB_CB_ACCURACY
+    grays = [cv2.cvtColor(img, cv2.COLOR_BGR2GRAY) for img in images]
+    image_size = grays[0].shape[::-1]
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        results = list(
+            executor.map(lambda gray: cv2.findChessboardCornersSB(gray, chess_size, flags=flags), grays)
+        )
+
+    # Collect the points for calibration
     obj_points = []
     img_points = []
     count_ret = 0
-    for img in images:
-        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-        ret, corners = cv2.findChessboardCorners(gray, chess_size, None)
+    for img, (ret, corners) in zip(images, results):
         if ret:
             obj_points.append(pattern_points)
             img_points.append(corners)
@@ -70,6 +116,6 @@ def calibrate_chessboard(
 
     # Perform camera calibration
     print("Calibrating camera...")
-    ret, mtx, dist_coeff, rvecs, tvecs = cv2.calibrateCamera(obj_points, img_points, gray.shape[::-1], None, None)
+    ret, mtx, dist_coeff, rvecs, tvecs = cv2.calibrateCamera(obj_points, img_points, image_size, None, None)
 
     return mtx, dist_coeff, rvecs, tvecs
\ No newline at end of file
@@ -0,0 +1,145 @@
+"""
+Utility functions for configuration files.
+"""
+
+import copy
+import json
+import os
+import yaml
+from dataclasses import fields
+from functools import lru_cache
+
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
+
+
+def load_config_file(file_path: str) -> dict:
+    """
+    Load a configuration dictionary from a YAML file.
+
+    The parsed configuration is cached as a `.cache.json` file next to the YAML file,
+    e.g. `camera.yaml.cache.json`. If the cache is at least as new as the YAML file,
+    it is loaded instead, which skips YAML parsing entirely. Otherwise, the YAML file
+    is parsed with the libyaml-backed safe loader when available, and the cache is
+    refreshed. The cache is only written if the configuration round-trips through JSON
+    unchanged, so that cached loads return the same dictionary as the first load.
+    Within a process, the configuration is also cached in memory until the
+    YAML file is modified, and a copy is returned to each caller.
+
+    Args:
+        file_path (str): The path to the YAML file.
+
+    Returns:
+        cfg (dict): The configuration dictionary.
+    """
+
+    file_path = os.path.abspath(file_path)
+
+    return copy.deepcopy(_read_config_file(file_path, os.stat(file_path).st_mtime_ns))
+
+
+@lru_cache(maxsize=32)
+def _read_config_file(file_path: str, mtime_ns: int) -> dict:
+    """
+    Read a configuration dictionary from a YAML file or its JSON cache.
+
+    Args:
+        file_path (str): The absolute path to the YAML file.
+        mtime_ns (int): The modification time of the YAML file, which invalidates the cache.
+
+    Returns:
+        cfg (dict): The configuration dictionary.
+    """
+
+    json_path = f"{file_path}.cache.json"
+
+    # Load the cached configuration if it is up to date
+    try:
+        if os.stat(json_path).st_mtime_ns >= mtime_ns:
+            with open(json_path, "r") as f:
+                return json.load(f)
+    except (OSError, ValueError):
+        pass
+
+    # Parse the YAML file
+    with open(file_path, "r") as f:
+        cfg = yaml.load(f, Loader=YamlLoader)
+    if cfg is None:
+        cfg = {}
+
+    # Skip the cache if JSON would change the configuration, e.g. int keys or dates
+    try:
+        payload = json.dumps(cfg)
+    except (TypeError, ValueError):
+        return cfg
+    if json.loads(payload) != cfg:
+        return cfg
+
+    # Write the cache atomically, ignoring read-only locations
+    tmp_path = f"{json_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "w") as f:
+            f.write(payload)
+        os.replace(tmp_path, json_path)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    return cfg
+
+
+@lru_cache(maxsize=None)
+def config_fields(cls: type) -> frozenset:
+    """
+    Get the field names of a configuration dataclass.
+
+    The result is cached per class, so repeated lookups are a set membership test
+    instead of an attribute probe on the instance.
+
+    Args:
+        cls (type): The configuration dataclass.
+
+    Returns:
+        names (frozenset): The field names of the dataclass.
+    """
+
+    return frozenset(f.name for f in fields(cls))
+
+
+def config_from_dict(cls: type, cfg: dict):
+    """
+    Create a configuration dataclass from a dictionary.
+
+    Keys that are not fields of the dataclass are ignored. Lists are converted
+    to tuples, matching the immutable sequence types used by the dataclasses.
+
+    Args:
+        cls (type): The configuration dataclass.
+        cfg (dict): The configuration dictionary.
+
+    Returns:
+        config: The configuration dataclass instance.
+    """
+
+    names = config_fields(cls)
+
+    return cls(**{k: _to_tuple(v) for k, v in cfg.items() if k in names})
+
+
+def _to_tuple(value):
+    """
+    Recursively convert lists to tuples.
+
+    Args:
+        value: The value to convert.
+
+    Returns:
+        value: The converted value.
+    """
+
+    if isinstance(value, list):
+        return tuple(_to_tuple(v) for v in value)
+
+    return value
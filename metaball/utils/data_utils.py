@@ -5,47 +5,72 @@ Utility functions for handling data.
 import os
 import numpy as np
 import cv2
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
 
 
-def save_data(data: list[tuple], data_dir: str) -> None:
+def save_data(data: list[tuple], data_dir: str, fmt: str = "csv") -> None:
     """
     Save the data to files.
 
     Args:
         data_dir (str): The directory to save the data to.
         data (list): The data to save.
+        fmt (str, optional): The format of the pose and force files, "csv" or "npy".
+            The binary "npy" format is much faster to write for large datasets. Default is "csv".
     """
+    if fmt not in ("csv", "npy"):
+        raise ValueError("Unsupported data format.")
+
     # Create a directory to save the data
     os.makedirs(data_dir, exist_ok=True)
     os.makedirs(os.path.join(data_dir, "images"), exist_ok=True)
     print(f"Saving data to {data_dir}...")
 
-    pose_list = []
-    force_list = []
-    # Save the data to files
-    for i, d in enumerate(data):
-        # Unpack the data
-        pose, force, img = d
+    # Preallocate the pose and force arrays
+    pose_dim = np.size(data[0][0]) if data else 0
+    force_dim = np.size(data[0][1]) if data else 0
+    pose_list = np.empty((len(data), pose_dim))
+    force_list = np.empty((len(data), force_dim))
+
+    # Save the data to files, writing the images in parallel
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        futures = []
+        for i, d in enumerate(data):
+            # Unpack the data
+            pose, force, img = d
+
+            # Save the image
+            img_path = os.path.join(data_dir, "images", f"{i}.jpg")
+            futures.append((img_path, executor.submit(cv2.imwrite, img_path, img)))
 
-        # Save the image
-        img_path = os.path.join(data_dir, "images", f"{i}.jpg")
-        cv2.imwrite(img_path, img)
+            # Write the pose and force data to the arrays
+            pose_list[i] = np.ravel(pose)
+            force_list[i] = np.ravel(force)
 
-        # Add the pose and force data to the lists
-        pose_list.append(pose)
-        force_list.append(force)
+        # Wait for the images, and raise if any of them failed to be written
+        for img_path, future in futures:
+            if not future.result():
+                raise IOError(f"Failed to write {img_path}")
 
     # Save the pose and force data to files
-    pose_list = np.array(pose_list)
-    force_list = np.array(force_list)
-    np.savetxt(os.path.join(data_dir, "pose.csv"), pose_list, fmt="%.6f", delimiter=",")
-    np.savetxt(os.path.join(data_dir, "force.csv"), force_list, fmt="%.6f", delimiter=",")
+    if fmt == "csv":
+        np.savetxt(os.path.join(data_dir, "pose.csv"), pose_list, fmt="%.6f", delimiter=",")
+        np.savetxt(os.path.join(data_dir, "force.csv"), force_list, fmt="%.6f", delimiter=",")
+    else:
+        np.save(os.path.join(data_dir, "pose.npy"), pose_list)
+        np.save(os.path.join(data_dir, "force.npy"), force_list)
 
     # Print the number of frames saved
     print(f"Saved {len(data)} frames to {data_dir}.")
 
 
-def force_sensor2global(force: np.ndarray, s2g_rmat: np.ndarray, s2g_tvec: np.ndarray) -> np.ndarray:
+def force_sensor2global(
+    force: np.ndarray,
+    s2g_rmat: np.ndarray,
+    s2g_tvec: np.ndarray,
+    out: Optional[np.ndarray] = None,
+) -> np.ndarray:
     """
     Convert the force/torque sensor data from the sensor frame to the global frame.
 
@@ -53,16 +78,54 @@ def force_sensor2global(force: np.ndarray, s2g_rmat: np.ndarray, s2g_tvec: np.nd
         force (numpy.ndarray): The force/torque data from the sensor.
         s2g_rmat (numpy.ndarray): The rotation matrix from the sensor frame to the global frame.
         s2g_tvec (numpy.ndarray): The translation vector from the sensor frame to the global frame.
+        out (numpy.ndarray, optional): A float64 buffer of 6 elements to write the result into,
+            so that callers at a high rate can reuse it. Defaults to None.
 
     Returns:
         np.ndarray: The converted force/torque data in the global frame.
     """
 
-    global_force = np.zeros(6)
+    if out is None:
+        out = np.empty(6)
+    force = np.asarray(force, dtype=np.float64)
+    s2g_rmat = np.asarray(s2g_rmat, dtype=np.float64)
+
     # Convert the force to the global frame
-    global_force[:3] = np.dot(s2g_rmat, force[:3])
+    np.dot(s2g_rmat, force[:3], out=out[:3])
     # Convert the torque to the global frame
-    global_force[3:] = np.dot(s2g_rmat, force[3:]) + np.cross(s2g_tvec, global_force[:3])
+    np.dot(s2g_rmat, force[3:], out=out[3:])
+    # Add the moment of the force, with the cross product written out for 3-vectors
+    tx, ty, tz = s2g_tvec
+    fx, fy, fz = out[:3]
+    out[3] += ty * fz - tz * fy
+    out[4] += tz * fx - tx * fz
+    out[5] += tx * fy - ty * fx
+
+    # Return the global force/torque data
+    return out
+
+
+def force_sensor2global_batch(force: np.ndarray, s2g_rmat: np.ndarray, s2g_tvec: np.ndarray) -> np.ndarray:
+    """
+    Convert a batch of force/torque sensor data from the sensor frame to the global frame.
+
+    Args:
+        force (numpy.ndarray([n, 6])): The force/torque data from the sensor.
+        s2g_rmat (numpy.ndarray): The rotation matrix from the sensor frame to the global frame.
+        s2g_tvec (numpy.ndarray): The translation vector from the sensor frame to the global frame.
+
+    Returns:
+        np.ndarray([n, 6]): The converted force/torque data in the global frame.
+    """
+
+    force = np.asarray(force, dtype=np.float64).reshape(-1, 6)
+    s2g_rmat = np.asarray(s2g_rmat, dtype=np.float64)
+
+    global_force = np.empty_like(force)
+    # Convert the forces to the global frame
+    global_force[:, :3] = force[:, :3] @ s2g_rmat.T
+    # Convert the torques to the global frame
+    global_force[:, 3:] = force[:, 3:] @ s2g_rmat.T + np.cross(s2g_tvec, global_force[:, :3])
 
     # Return the global force/torque data
     return global_force
@@ -6,13 +6,17 @@ import os
 import onnxruntime as ort
 
 
-def init_model(onnx_path: str, device: str = "auto") -> ort.InferenceSession:
+def init_model(onnx_path: str, device: str = "auto", num_threads: int = 1) -> ort.InferenceSession:
     """
     Initialize an ONNX model.
 
+    The operators are run sequentially, and the intra-op threads spin while waiting
+    for work, which suits the small latency-bound model.
+
     Args:
         onnx_path (str): The path to the ONNX model file.
-        device (str, optional): The device to be used for inference. Options are "auto", "cuda", "hailo", or "cpu".
+        device (str, optional): The device to be used for inference. Options are "auto", "cuda", "tensorrt", "hailo", or "cpu".
+        num_threads (int, optional): The number of intra-op threads. Default is 1.
 
     Returns:
         ort.InferenceSession: The loaded ONNX model.
@@ -24,23 +28,34 @@ def init_model(onnx_path: str, device: str = "auto") -> ort.InferenceSession:
         raise ValueError("The model path does not exist.")
 
     sess_options = ort.SessionOptions()
-    sess_options.intra_op_num_threads = 1
+    sess_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    sess_options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+    sess_options.intra_op_num_threads = num_threads
     sess_options.inter_op_num_threads = 1
+    sess_options.add_session_config_entry("session.intra_op.allow_spinning", "1")
     sess_options.log_severity_level = 3
 
-    return ort.InferenceSession(onnx_path, sess_options, providers=[get_provider(device)])
+    # Fall back to CUDA and then the CPU for the operators not supported by the accelerator
+    providers = [get_provider(device)]
+    available_providers = ort.get_available_providers()
+    if providers[0] == "TensorrtExecutionProvider" and "CUDAExecutionProvider" in available_providers:
+        providers.append("CUDAExecutionProvider")
+    if providers[0] != "CPUExecutionProvider":
+        providers.append("CPUExecutionProvider")
+
+    return ort.InferenceSession(onnx_path, sess_options, providers=providers)
 
 
 def get_provider(devices: str = "auto") -> str:
     """
     Get the device for ONNX model inference.
 
-    This function checks if CUDA, or Hailo are available,
-    and returns the appropriate provider for ONNX model inference.
-    If none of these providers are available, it defaults to CPUExecutionProvider.
+    For a specific device, this function checks if its provider is available.
+    For "auto", it returns the first available provider among TensorRT and CUDA,
+    and defaults to CPUExecutionProvider if neither is available.
 
     Args:
-        devices (str, optional): The device to be used for inference. Options are "auto", "cuda", "hailo", or "cpu".
+        devices (str, optional): The device to be used for inference. Options are "auto", "cuda", "tensorrt", "hailo", or "cpu".
 
     Returns:
         provider (str): The provider to be used for ONNX model inference.
@@ -56,12 +71,22 @@ def get_provider(devices: str = "auto") -> str:
             return "CUDAExecutionProvider"
         else:
             raise ValueError("CUDAExecutionProvider is not available.")
+    elif devices == "tensorrt":
+        if "TensorrtExecutionProvider" in available_providers:
+            return "TensorrtExecutionProvider"
+        else:
+            raise ValueError("TensorrtExecutionProvider is not available.")
     elif devices == "hailo":
         if "HailoExecutionProvider" in available_providers:
             return "HailoExecutionProvider"
         else:
             raise ValueError("HailoExecutionProvider is not available.")
-    elif devices == "auto" or devices == "cpu":
+    elif devices == "auto":
+        for provider in ("TensorrtExecutionProvider", "CUDAExecutionProvider"):
+            if provider in available_providers:
+                return provider
+        return "CPUExecutionProvider"
+    elif devices == "cpu":
         return "CPUExecutionProvider"
     else:
         raise ValueError("Unsupported device type.")
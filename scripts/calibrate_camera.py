@@ -30,14 +30,47 @@ The calibration results should be copied to the `configs` directory for further
 import argparse
 import sys
 import os
+import queue
+import threading
 import cv2
 import yaml
 import zmq
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from metaball.modules.protobuf import cam_msg_pb2
 from metaball.utils.camera_utils import calibrate_chessboard
 
 
+def recv_worker(socket: zmq.Socket, latest: queue.Queue, stop_event: threading.Event) -> None:
+    """
+    Receive and decode the frames from the camera in the background.
+
+    Only the latest frame is kept, so that receiving and decoding the next frame
+    overlap with displaying the current one.
+
+    Args:
+        socket (zmq.Socket): The socket subscribed to the camera.
+        latest (queue.Queue): The single-slot queue for the latest decoded frame.
+        stop_event (threading.Event): The event to stop receiving.
+    """
+
+    cam_msg = cam_msg_pb2.Camera()
+    while not stop_event.is_set():
+        if not socket.poll(100):
+            continue
+
+        # Read the frame, parsing it directly from the ZMQ frame buffer
+        cam_msg.ParseFromString(socket.recv(copy=False).buffer)
+        img = cv2.imdecode(np.frombuffer(cam_msg.img, dtype=np.uint8), cv2.IMREAD_COLOR)
+
+        # Replace the stale frame if it has not been displayed yet
+        try:
+            latest.get_nowait()
+        except queue.Empty:
+            pass
+        latest.put_nowait(img)
+
+
 def main(name: str, host: str, port: int, width: int, height: int) -> None:
     """
     Main function to calibrate the camera.
@@ -54,6 +87,10 @@ def main(name: str, host: str, port: int, width: int, height: int) -> None:
     try:
         context = zmq.Context()
         socket = context.socket(zmq.SUB)
+        # Keep only the latest frame, and drop pending frames on close
+        socket.setsockopt(zmq.CONFLATE, 1)
+        socket.setsockopt(zmq.RCVHWM, 1)
+        socket.setsockopt(zmq.LINGER, 0)
         socket.connect(f"tcp://{host}:{port}")
         socket.setsockopt_string(zmq.SUBSCRIBE, "")
     except Exception as e:
@@ -61,7 +98,7 @@ def main(name: str, host: str, port: int, width: int, height: int) -> None:
         print("\033[31mPlease check the camera host.\033[0m")
         sys.exit()
     cam_msg = cam_msg_pb2.Camera()
-    cam_msg.ParseFromString(socket.recv())
+    cam_msg.ParseFromString(socket.recv(copy=False).buffer)
     img = cv2.imdecode(np.frombuffer(cam_msg.img, dtype=np.uint8), cv2.IMREAD_COLOR)
 
     # Print camera information
@@ -87,13 +124,18 @@ def main(name: str, host: str, port: int, width: int, height: int) -> None:
     print("Press 'c' to capture the image.")
     print("Press 'ESC' to quit capturing.")
     count = 0
+    latest = queue.Queue(maxsize=1)
+    stop_event = threading.Event()
+    recv_thread = threading.Thread(target=recv_worker, args=(socket, latest, stop_event), daemon=True)
+    recv_thread.start()
     while True:
-        # Read the frame from the camera
-        cam_msg.ParseFromString(socket.recv())
-        img = cv2.imdecode(np.frombuffer(cam_msg.img, dtype=np.uint8), cv2.IMREAD_COLOR)
-
-        # Display the frame
-        cv2.imshow(name, img)
+        # Display the latest frame, waiting for it instead of spinning on the key check
+        try:
+            img = latest.get(timeout=0.05)
+        except queue.Empty:
+            pass
+        else:
+            cv2.imshow(name, img)
 
         # Check for key presses
         key = cv2.waitKey(1)
@@ -107,7 +149,9 @@ def main(name: str, host: str, port: int, width: int, height: int) -> None:
             print(f"{count}.jpg saved.")
             count += 1
 
-    # Close the camera
+    # Stop receiving and close the camera
+    stop_event.set()
+    recv_thread.join()
     socket.close()
     context.term()
 
@@ -134,11 +178,17 @@ def main(name: str, host: str, port: int, width: int, height: int) -> None:
 
         # Load the images for calibration
         print("Loading images for calibration...")
-        images = []
-        for img_name in os.listdir(img_dir):
-            img_path = os.path.join(img_dir, img_name)
-            img = cv2.imread(img_path)
-            images.append(img)
+        img_paths = [
+            os.path.join(img_dir, img_name) for img_name in os.listdir(img_dir) if img_name.endswith(".jpg")
+        ]
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            images = list(executor.map(cv2.imread, img_paths))
+
+        # Skip the images that cannot be read
+        for img_path, img in zip(img_paths, images):
+            if img is None:
+                print(f"\033[33mWarning: cannot read {img_path}, skipped.\033[0m")
+        images = [img for img in images if img is not None]
 
         # Find chessboard corners in the images
         print("Finding chessboard corners...")
@@ -17,16 +17,18 @@ Various configuration options are available:
 | --port        | Port number for the publisher.                | int    | 6666                             |
 | --camera-yaml | Path to the camera configuration YAML file.   | str    | ./configs/maixcam-xxxx.yaml      |
 | --onnx-path   | Path to the ONNX model file.                  | str    | ./models/BallNet.onnx            |
+| --device      | Device for ONNX model inference.              | str    | auto                             |
 ╰───────────────────────────────────────────────────────────────────────────────────────────────────────────╯
 """
 
 import tyro
-from metaball import MetaBall
 from metaball.configs.deploy import DeployConfig
 
 def main():
     cfg = tyro.cli(DeployConfig)
 
+    from metaball import MetaBall
+
     metaball = MetaBall(cfg=cfg)
     metaball.run()
     
@@ -8,10 +8,11 @@ This script is to export the trained model to ONNX format.
 Example usage:
 
 ```bash
-python export_onnx.py --ckpt_dir <ckpt_dir>
+python export_onnx.py --ckpt_dir <ckpt_dir> [--int8]
 ```
 
 where <ckpt_dir> is the path to the checkpoint folder.
+With --int8, a copy with INT8 quantized weights is also saved as model.int8.onnx.
 """
 
 import argparse
@@ -21,12 +22,13 @@ import onnx
 from metaball.models import BallNet
 
 
-def onnx_export(ckpt_dir: str) -> None:
+def onnx_export(ckpt_dir: str, int8: bool = False) -> None:
     """
     Export the trained model to ONNX format.
 
     Args:
         ckpt_dir (str): Path to the checkpoint folder.
+        int8 (bool, optional): Whether to also save a copy with INT8 quantized weights. Default is False.
     """
 
     ckpt_path = os.path.join(ckpt_dir, "checkpoints", os.listdir(os.path.join(ckpt_dir, "checkpoints"))[0])
@@ -59,6 +61,12 @@ def onnx_export(ckpt_dir: str) -> None:
 
     print(f"Exported the model to {onnx_path}")
 
+    # Quantize the weights to INT8, importing ONNX Runtime only when it is needed
+    if int8:
+        from quantize_onnx import onnx_quantize
+
+        onnx_quantize(onnx_path, "int8")
+
     # Check the exported model
     onnx_model = onnx.load(onnx_path)
 
@@ -84,6 +92,11 @@ if __name__ == "__main__":
         type=str,
         help="Path to the checkpoint folder.",
     )
+    parser.add_argument(
+        "--int8",
+        action="store_true",
+        help="Also save a copy with INT8 quantized weights.",
+    )
     args = parser.parse_args()
 
-    onnx_export(args.ckpt_dir)
+    onnx_export(args.ckpt_dir, args.int8)
@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+
+"""
+Quantize ONNX Model
+
+This script is to quantize the exported ONNX model for faster inference on the CPU.
+The weights are quantized to INT8 with dynamic quantization,
+or the model is converted to FP16 with float32 inputs and outputs.
+
+Example usage:
+
+```bash
+python quantize_onnx.py --onnx_path <onnx_path> --precision int8
+```
+
+where <onnx_path> is the path to the exported ONNX model.
+The quantized model is saved next to it, e.g. model.int8.onnx,
+and can be deployed by passing its path as the ONNX model path.
+"""
+
+import argparse
+import os
+import onnx
+from onnxruntime.quantization import QuantType, quantize_dynamic
+from onnxruntime.transformers.float16 import convert_float_to_float16
+
+
+def onnx_quantize(onnx_path: str, precision: str = "int8") -> str:
+    """
+    Quantize the ONNX model.
+
+    Args:
+        onnx_path (str): Path to the ONNX model file.
+        precision (str, optional): The target precision, "int8" or "fp16". Default is "int8".
+
+    Returns:
+        output_path (str): Path to the quantized ONNX model file.
+    """
+
+    if not os.path.exists(onnx_path):
+        raise ValueError("The model path does not exist.")
+
+    output_path = f"{os.path.splitext(onnx_path)[0]}.{precision}.onnx"
+
+    if precision == "int8":
+        # Quantize the weights to INT8, and the activations dynamically at runtime
+        quantize_dynamic(onnx_path, output_path, weight_type=QuantType.QInt8)
+    elif precision == "fp16":
+        # Convert the model to FP16, keeping the float32 inputs and outputs
+        onnx_model = convert_float_to_float16(onnx.load(onnx_path), keep_io_types=True)
+        onnx.save(onnx_model, output_path)
+    else:
+        raise ValueError("Unsupported precision.")
+
+    print(f"Quantized the model to {output_path}")
+    print(f"Size: {os.path.getsize(onnx_path) / 1024:.1f} KB -> {os.path.getsize(output_path) / 1024:.1f} KB")
+
+    return output_path
+
+
+if __name__ == "__main__":
+    # Parse command line arguments
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--onnx_path",
+        type=str,
+        help="Path to the ONNX model file.",
+    )
+    parser.add_argument(
+        "--precision",
+        type=str,
+        default="int8",
+        choices=["int8", "fp16"],
+        help="Target precision of the quantized model.",
+    )
+    args = parser.parse_args()
+
+    onnx_quantize(args.onnx_path, args.precision)